@@ -7,7 +7,10 @@ Usage:
   python codon_start.py --genome sequence.fasta --protein geneX.fasta
 """
 import argparse
+import itertools
+import re
 import sys
+import numpy as np
 from utils import read_single_fasta_sequence
 
 
@@ -30,21 +33,52 @@ code_genetique = {
     'GGT':'G','GGC':'G','GGA':'G','GGG':'G',
 }
 
-def traduire_cadre(adn: str, cadre: int) -> str:
+# Nucléotide -> 2 bits (A, C, G, T -> 0..3) ; tout autre octet -> 4 (codon inconnu).
+NT_LUT = np.full(256, 4, dtype=np.uint8)
+NT_LUT[list(b"ACGT")] = np.arange(4)
+
+# Table de traduction à 64 entrées indexée par (n1 << 4) | (n2 << 2) | n3.
+AA_TABLE = bytes(ord(code_genetique.get(''.join(codon), 'X'))
+                 for codon in itertools.product('ACGT', repeat=3))
+AA_TABLE_NP = np.frombuffer(AA_TABLE, dtype=np.uint8)
+
+def traduire_cadre_octets(adn: str, cadre: int) -> bytes:
     """
     Une fonction qui prend en argument une séquence d'ADN (adn) et un entier (cadre ∈ {0,1,2}).
 
     Elle traduit la séquence en acides aminés dans le cadre spécifié selon le code génétique standard
-    (les codons inconnus deviennent 'X').
+    (les codons inconnus deviennent 'X'). Chaque nucléotide est codé sur 2 bits via NT_LUT, puis
+    chaque codon est traduit d'un coup par indexation dans AA_TABLE_NP (64 entrées).
+
+    Rend la traduction du cadre choisi sous forme de bytes (un octet ASCII par acide aminé).
+    """
+    nt = NT_LUT[np.frombuffer(adn[cadre:].encode('ascii', errors='replace'), dtype=np.uint8)]
+    nt = nt[:len(nt) - len(nt) % 3]
+    n1, n2, n3 = nt[0::3], nt[1::3], nt[2::3]
+    aa = AA_TABLE_NP[((n1 & 3) << 4) | ((n2 & 3) << 2) | (n3 & 3)]
+    aa[(n1 | n2 | n3) > 3] = ord('X')           # codon contenant un nucléotide inconnu
+    return aa.tobytes()
+
+def traduire_cadre(adn: str, cadre: int) -> str:
+    """
+    Une fonction qui prend en argument une séquence d'ADN (adn) et un entier (cadre ∈ {0,1,2}).
+
+    Elle traduit le cadre via traduire_cadre_octets et décode le résultat.
 
     Rend une chaîne correspondant à la traduction en acides aminés du cadre choisi.
     """
-    s = adn[cadre:]
-    aa = []
-    for i in range(0, len(s) - 2, 3):
-        codon = s[i:i+3]
-        aa.append(code_genetique.get(codon, 'X'))
-    return ''.join(aa)
+    return traduire_cadre_octets(adn, cadre).decode('ascii')
+
+def traduire_trois_cadres(adn: str) -> list[bytes]:
+    """
+    Une fonction qui prend en argument une séquence d'ADN (adn).
+
+    Elle traduit une seule fois les trois cadres du brin codant, pour que les deux recherches
+    (complète, puis par préfixe) partagent les mêmes traductions.
+
+    Rend la liste [cadre 0, cadre 1, cadre 2] des traductions en bytes.
+    """
+    return [traduire_cadre_octets(adn, f) for f in (0, 1, 2)]
 
 def lire_sequences(chemin_genome: str, chemin_proteine: str) -> tuple[str, str]:
     """
@@ -58,59 +92,68 @@ def lire_sequences(chemin_genome: str, chemin_proteine: str) -> tuple[str, str]:
     prot = read_single_fasta_sequence(chemin_proteine).replace('U', 'T').upper().rstrip('*')
     return adn, prot
 
-def cadre_par_recherche_complete(adn: str, proteine: str) -> list[tuple[int, int]]:
+def cadre_par_recherche_complete(adn: str, proteine: str,
+                                 traductions: list[bytes] | None = None) -> list[tuple[int, int]]:
     """
-    Une fonction qui prend en argument l'ADN (adn) et la protéine (proteine).
+    Une fonction qui prend en argument l'ADN (adn), la protéine (proteine) et, optionnellement,
+    les traductions déjà calculées des trois cadres (traductions, voir traduire_trois_cadres).
 
     Elle cherche la protéine comme sous-chaîne stricte et contiguë dans chaque cadre du brin codant.
+    La recherche se fait sur des bytes (pas de str Unicode à largeur variable).
     Pour chaque hit, elle collecte (cadre, nt0) où nt0 = position 0-based de l'ATG correspondant.
 
     Rend une liste de couples (cadre, nt0) triée par nt0 croissant.
     """
     candidats: list[tuple[int, int]] = []
-    for f in (0, 1, 2):
-        aa = traduire_cadre(adn, f)
-        j = aa.find(proteine)
+    prot_bytes = proteine.encode('ascii', errors='replace')
+    if traductions is None:
+        traductions = traduire_trois_cadres(adn)
+    for f, aa in enumerate(traductions):
+        j = aa.find(prot_bytes)
         if j != -1:
             nt0 = f + 3 * j
             candidats.append((f, nt0))
     candidats.sort(key=lambda t: t[1])
     return candidats
 
-def cadre_par_prefixe_met(adn: str, proteine: str, min_prefixe: int = 10) -> int | None:
+def cadre_par_prefixe_met(adn: str, proteine: str, min_prefixe: int = 10,
+                          traductions: list[bytes] | None = None) -> int | None:
     """
-    Une fonction qui prend en argument l'ADN (adn), la protéine (proteine) et une longueur minimale (min_prefixe).
+    Une fonction qui prend en argument l'ADN (adn), la protéine (proteine), une longueur minimale (min_prefixe)
+    et, optionnellement, les traductions déjà calculées des trois cadres (traductions).
 
     Elle cherche, pour chaque cadre, le plus long préfixe de 'proteine' (longueur ≥ min_prefixe) qui apparaît
-    comme sous-chaîne dans la traduction du cadre.
+    comme sous-chaîne dans la traduction du cadre, à partir d'une Met.
+    Seules les positions où apparaît déjà le préfixe minimal sont examinées : elles sont trouvées par
+    une expression régulière précompilée sur des bytes (avec lookahead, pour garder les hits chevauchants).
     En cas d'égalité de longueur, elle choisit le hit le plus en amont en nucléotides.
 
     Rend l'entier 'cadre' (0,1,2) si trouvé, sinon None.
     """
     meilleurs: list[tuple[int, int, int]] = []  # (longueur_prefixe, nt0, cadre)
     L = len(proteine)
-    for f in (0, 1, 2):
-        aa = traduire_cadre(adn, f)
+    prot_bytes = proteine.encode('ascii', errors='replace')
+    prot_arr = np.frombuffer(prot_bytes, dtype=np.uint8)
+    longueur_min = max(min_prefixe, 1)
+    if L < longueur_min or not prot_bytes.startswith(b'M'):
+        return None                             # aucun préfixe admissible ne commence par une Met
+    motif = re.compile(b'(?=' + re.escape(prot_bytes[:longueur_min]) + b')')
+    if traductions is None:
+        traductions = traduire_trois_cadres(adn)
+    for f, aa in enumerate(traductions):
+        aa_arr = np.frombuffer(aa, dtype=np.uint8)
         meilleur_len = 0
         meilleur_nt0 = 10**12
-        start = 0                               
-        while True:
-            j = aa.find('M', start)
-            if j == -1:
-                break
-            max_len = 0
-            
-            maxL = min(L, len(aa) - j)          # Borne supérieure : ne pas dépasser aa ni proteine
-            k = 0
-            while k < maxL and aa[j + k] == proteine[k]:
-                k += 1
-            max_len = k
+        for hit in motif.finditer(aa):
+            j = hit.start()
+            maxL = min(L, len(aa_arr) - j)      # Borne supérieure : ne pas dépasser aa ni proteine
+            diff = aa_arr[j:j + maxL] != prot_arr[:maxL]
+            max_len = int(np.argmax(diff)) if diff.any() else maxL   # premier mismatch
             if max_len >= min_prefixe:
                 nt0 = f + 3 * j
                 if (max_len > meilleur_len) or (max_len == meilleur_len and nt0 < meilleur_nt0):
                     meilleur_len = max_len
                     meilleur_nt0 = nt0
-            start = j + 1
         if meilleur_len > 0:
             meilleurs.append((meilleur_len, meilleur_nt0, f))
     if not meilleurs:
@@ -125,13 +168,14 @@ def main():
     args = p.parse_args()
 
     adn, proteine = lire_sequences(args.genome, args.protein)
-    hits = cadre_par_recherche_complete(adn, proteine)
+    traductions = traduire_trois_cadres(adn)
+    hits = cadre_par_recherche_complete(adn, proteine, traductions)
     if hits:
         cadre = hits[0][0]
         print(f"Cadre {cadre+1}")
         return
 
-    cadre = cadre_par_prefixe_met(adn, proteine, min_prefixe=10)
+    cadre = cadre_par_prefixe_met(adn, proteine, min_prefixe=10, traductions=traductions)
     if cadre is None:
         print("Aucun cadre compatible trouvé sur le brin codant.")
         sys.exit(1)
@@ -12,60 +12,105 @@ Usage :
 
 import argparse
 import csv
-from collections import defaultdict, deque
+from collections import deque
+import numpy as np
 
 
-def read_scores_matrix(csv_path: str) -> tuple[list[str], dict[str, dict[str, int]]]:
+def read_scores_matrix(csv_path: str) -> tuple[list[str], np.ndarray]:
     """
     Une fonction qui prend en argument le chemin d’un fichier CSV (csv_path) représentant une matrice 20x20.
 
-    Elle lit le CSV, vérifie la présence d’un en-tête avec la première colonne 'id', puis
-    construit et retourne la liste des identifiants (ids) et un dictionnaire M tel que M[u][v] = score_ij.
+    Elle lit l’en-tête avec csv (première colonne 'id'), puis charge toutes les lignes de scores
+    d’un seul appel np.loadtxt ; la conversion en entiers est faite sur le bloc entier.
+    Les lignes sont rangées selon l’ordre de l’en-tête.
 
-    Rend un couple (ids, M) où ids est une liste d’IDs de reads et M une table de scores (dict de dict).
+    Rend un couple (ids, M) où ids est une liste d’IDs de reads et M un tableau numpy (n, n) d’entiers
+    tel que M[i, j] = score du read ids[i] vers le read ids[j].
     """
     with open(csv_path, "r", encoding="utf-8") as f:
-        rows = [row for row in csv.reader(f) if row]  # ignore lignes vides
-
-    if not rows or len(rows) < 2:
+        header = next((row for row in csv.reader(f) if row), None)   # ignore lignes vides
+        if header is None:
+            raise ValueError("CSV invalide: pas assez de lignes.")
+        if header[0] != "id" or len(header) < 2:
+            raise ValueError("Entête invalide: la première cellule doit être 'id'.")
+        lignes = [ligne for ligne in f if ligne.strip()]
+    if not lignes:
         raise ValueError("CSV invalide: pas assez de lignes.")
-    header = rows[0]
-    if header[0] != "id" or len(header) < 2:
-        raise ValueError("Entête invalide: la première cellule doit être 'id'.")
-
     ids = header[1:]
-    M: dict[str, dict[str, int]] = {u: {} for u in ids}
-    for row in rows[1:]:
-        rid = row[0]
-        vals = row[1:]
-        if len(vals) != len(ids):
-            raise ValueError(f"Ligne incohérente pour {rid}: {len(vals)} valeurs, attendu {len(ids)}.")
-        for j, v in enumerate(ids):
-            try:
-                M[rid][v] = int(float(vals[j].strip()))
-            except ValueError:
-                raise ValueError(f"Score non entier en ({rid},{v}): {vals[j]!r}")
+    data, erreur = None, "colonnes illisibles"
+    try:
+        data = np.loadtxt(lignes, delimiter=",", quotechar='"', comments=None, dtype=str, ndmin=2)
+    except ValueError as e:
+        erreur = str(e)
+    if data is None or data.shape[1] - 1 != len(ids):
+        for row in csv.reader(lignes):                      # repérer la première ligne fautive
+            if len(row) - 1 != len(ids):
+                raise ValueError(f"Ligne incohérente pour {row[0]}: {len(row) - 1} valeurs, attendu {len(ids)}.")
+        raise ValueError(f"CSV invalide: {erreur}")
+
+    index = {u: i for i, u in enumerate(ids)}
+    rids = data[:, 0].tolist()
+    inconnues = [rid for rid in rids if rid not in index]
+    if inconnues:
+        raise ValueError(f"Ligne inconnue {inconnues[0]!r}: absente de l’entête.")
+    vues: set[str] = set()
+    for rid in rids:
+        if rid in vues:
+            raise ValueError(f"Ligne dupliquée {rid!r}.")
+        vues.add(rid)
+    manquantes = [u for u in ids if u not in vues]
+    if manquantes:
+        raise ValueError(f"Ligne manquante {manquantes[0]!r}: présente dans l’entête mais pas dans le corps.")
+
+    try:
+        scores = data[:, 1:].astype(np.float64)
+    except ValueError:
+        scores = None
+    limite = float(np.iinfo(np.int64).max)
+    if scores is None or not (np.abs(scores) < limite).all():   # rejette aussi inf et nan
+        for rid, vals in zip(rids, data[:, 1:].tolist()):     # repérer la première cellule fautive
+            for v, cellule in zip(ids, vals):
+                try:
+                    ok = abs(float(cellule)) < limite
+                except ValueError:
+                    ok = False
+                if not ok:
+                    raise ValueError(f"Score non entier en ({rid},{v}): {cellule!r}")
+
+    M = np.zeros((len(ids), len(ids)), dtype=np.int64)
+    M[[index[rid] for rid in rids]] = scores.astype(np.int64)
     return ids, M
 
 
-def build_graph_from_matrix(ids: list[str], M: dict[str, dict[str, int]], threshold: int) -> dict[str, dict[str, int]]:
+def build_graph_from_matrix(ids: list[str], M: np.ndarray, threshold: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Une fonction qui prend en argument la liste des IDs (ids), la matrice des scores M et un seuil (threshold).
+
+    Elle sélectionne en une seule passe NumPy les arêtes u->v telles que (u != v) et M[u, v] >= threshold
+    (masque booléen sur la matrice dense, diagonale exclue).
+
+    Rend un triplet (u_idx, v_idx, scores) de tableaux alignés : indices (dans ids) des origines,
+    des destinations, et scores des arêtes, dans l’ordre ligne par ligne de M.
+    """
+    mask = M >= threshold
+    np.fill_diagonal(mask, False)
+    u_idx, v_idx = np.nonzero(mask)
+    return u_idx, v_idx, M[u_idx, v_idx]
+
+
+def graph_from_edges(ids: list[str], u_idx: np.ndarray, v_idx: np.ndarray, scores: np.ndarray) -> dict[str, dict[str, int]]:
     """
-    Une fonction qui prend en argument la liste des IDs (ids), la table des scores M et un seuil (threshold).
+    Une fonction qui prend en argument la liste des IDs (ids) et les arêtes (u_idx, v_idx, scores)
+    rendues par build_graph_from_matrix.
 
-    Elle construit un graphe orienté G où l’on garde l’arête u->v si (u != v) et M[u][v] >= threshold.
-    En cas de doublon, elle conserve le score maximal pour l’arête.
+    Elle convertit ces arêtes en dictionnaire d’adjacence, la forme attendue par break_two_cycles,
+    transitive_reduction et write_dot.
 
     Rend un dictionnaire d’adjacence G tel que G[u][v] = score.
     """
-    G: dict[str, dict[str, int]] = defaultdict(dict)
-    for u in ids:
-        for v in ids:
-            if u == v:
-                continue
-            s = int(M[u][v])
-            if s >= threshold:
-                if v not in G[u] or s > G[u][v]:    # garde le meilleur si doublon
-                    G[u][v] = s
+    G: dict[str, dict[str, int]] = {}
+    for u, v, s in zip(u_idx.tolist(), v_idx.tolist(), scores.tolist()):
+        G.setdefault(ids[u], {})[ids[v]] = s
     return G
 
 
@@ -122,13 +167,29 @@ def transitive_reduction(G: dict[str, dict[str, int]]) -> None:
 
     Elle applique la réduction transitive : pour toute arête u->v, si v est atteignable
     depuis u par un autre chemin ne passant pas par (u->v), alors l’arête (u->v) est supprimée.
+    Toutes les arêtes sortant de u sont traitées en un seul parcours : dans le graphe privé
+    des arêtes sortant de u (un chemin qui revient en u ne peut repartir que vers un successeur
+    déjà considéré), u->v est redondante ssi v est atteignable depuis un autre successeur w != v.
+    Le parcours propage depuis chaque successeur son origine w ; chaque nœud retient au plus
+    deux origines distinctes, ce qui suffit à trouver un w != v, soit O(V + E) par origine u.
 
     Rend None (effet de bord : modifie G en place).
     """
     to_del: list[tuple[str, str]] = []
     for u in list(G.keys()):
+        origines: dict[str, list[str]] = {}
+        q = deque((w, w) for w in G[u])
+        while q:
+            x, w = q.popleft()
+            if x == u:
+                continue            # ignorer les arêtes sortant de u
+            for y in G.get(x, {}):
+                vues = origines.setdefault(y, [])
+                if w not in vues and len(vues) < 2:
+                    vues.append(w)
+                    q.append((y, w))
         for v in list(G[u].keys()):
-            if reachable_excluding_edge(G, u, v):
+            if v == u or any(w != v for w in origines.get(v, ())):
                 to_del.append((u, v))
     for u, v in to_del:
         if u in G and v in G[u]:
@@ -144,19 +205,18 @@ def write_dot(path: str, ids: list[str], G: dict[str, dict[str, int]], title: st
 
     Elle écrit un fichier au format Graphviz DOT avec les nœuds listés dans ids et les arêtes G[u][v]
     annotées par leurs scores (label), en configurant un rendu gauche-droite.
+    Le contenu est assemblé en mémoire puis écrit en un seul appel.
 
     Rend None (effet de bord : crée/écrit le fichier DOT).
     """
     safe_title = title.replace('"', "'")
+    parts = ['digraph "', safe_title, '" {\n',
+             "  rankdir=LR;\n  node [shape=box, fontsize=10];\n  overlap=false;\n  splines=true;\n"]
+    parts.extend(f'  "{u}";\n' for u in ids)
+    parts.extend(f'  "{u}" -> "{v}" [label="{s}"];\n' for u in ids for v, s in G.get(u, {}).items())
+    parts.append("}\n")
     with open(path, "w", encoding="utf-8") as f:
-        f.write('digraph "' + safe_title + '" {\n')
-        f.write("  rankdir=LR;\n  node [shape=box, fontsize=10];\n  overlap=false;\n  splines=true;\n")
-        for u in ids:
-            f.write(f'  "{u}";\n')
-        for u in ids:
-            for v, s in G.get(u, {}).items():
-                f.write(f'  "{u}" -> "{v}" [label="{s}"];\n')
-        f.write("}\n")
+        f.write("".join(parts))
 
 
 def main():
@@ -167,7 +227,7 @@ def main():
 
     ids, M = read_scores_matrix(args.scores_csv)
 
-    G_thresh = build_graph_from_matrix(ids, M, threshold=args.threshold)
+    G_thresh = graph_from_edges(ids, *build_graph_from_matrix(ids, M, threshold=args.threshold))
     write_dot("graph_1.dot", ids, G_thresh, f"Overlap >= {args.threshold}")
     print("Écrit : graph_1.dot")
 
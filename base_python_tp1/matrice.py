@@ -10,27 +10,50 @@ Usage :
   # options :
   #   --out matrice_20x20.csv
   #   --match 4 --mismatch -4 --gap -8
+  #   --use-codon [--codon-lib ./libchevauchement.so]   (noyau Codon, voir chevauchement.codon)
 """
 
 import argparse
 import csv
+import ctypes
+import numpy as np
 from utils import read_sequences_from_fastq
-from prefixe_suffixe import construire_tables_dp, meilleur_score_derniere_ligne
+from prefixe_suffixe import fill_score_last_row, overlap_matrix
 
 
 def overlap_score_only(X_i: str, X_j: str, match: int = 4, mismatch: int = -4, gap: int = -8) -> int:
     """
     Une fonction qui prend en argument deux reads (X_i, X_j) et trois scores (match, mismatch, gap).
 
-    Elle construit les tables de programmation dynamique via construire_tables_dp pour le
-    chevauchement suffixe(X_i) -> préfixe(X_j), puis récupère le meilleur score sur la
-    dernière ligne à l’aide de meilleur_score_derniere_ligne, sans reconstruire l’alignement.
+    Elle calcule le meilleur score sur la dernière ligne de la DP de chevauchement
+    suffixe(X_i) -> préfixe(X_j) via fill_score_last_row (deux lignes seulement, sans table
+    de remontée), sans reconstruire l’alignement.
 
     Rend un entier qui correspond au score optimal de chevauchement.
     """
-    V, _ = construire_tables_dp(X_i, X_j, match, mismatch, gap)
-    meilleur, _ = meilleur_score_derniere_ligne(V)
-    return int(meilleur)
+    return fill_score_last_row(X_i, X_j, match, mismatch, gap)
+
+
+def charger_noyau_codon(chemin_lib: str):
+    """
+    Une fonction qui prend en argument le chemin d’une bibliothèque partagée (chemin_lib)
+    compilée depuis chevauchement.codon.
+
+    Elle charge la bibliothèque via ctypes et déclare la signature C de overlap_score.
+
+    Rend une fonction (X_i, X_j, match, mismatch, gap) -> int équivalente à overlap_score_only.
+    """
+    lib = ctypes.CDLL(chemin_lib)
+    noyau = lib.overlap_score
+    noyau.argtypes = [ctypes.c_char_p, ctypes.c_int64, ctypes.c_char_p, ctypes.c_int64,
+                      ctypes.c_int64, ctypes.c_int64, ctypes.c_int64]
+    noyau.restype = ctypes.c_int64
+
+    def overlap_score_codon(X_i: str, X_j: str, match: int = 4, mismatch: int = -4, gap: int = -8) -> int:
+        a, b = X_i.encode("ascii"), X_j.encode("ascii")
+        return int(noyau(a, len(a), b, len(b), match, mismatch, gap))
+
+    return overlap_score_codon
 
 
 def main():
@@ -40,6 +63,10 @@ def main():
     parser.add_argument("--match", type=int, default=4)
     parser.add_argument("--mismatch", type=int, default=-4)
     parser.add_argument("--gap", type=int, default=-8)
+    parser.add_argument("--use-codon", action="store_true",
+                        help="calcule chaque score avec le noyau Codon compilé (voir --codon-lib)")
+    parser.add_argument("--codon-lib", default="./libchevauchement.so", metavar="PATH",
+                        help="bibliothèque compilée depuis chevauchement.codon (défaut : ./libchevauchement.so)")
     args = parser.parse_args()
 
     reads = read_sequences_from_fastq(args.fastq)
@@ -47,26 +74,22 @@ def main():
     if len(ids) != 20:
         raise ValueError(f"reads.fq doit contenir 20 reads, trouvé {len(ids)}.")
 
-    n = len(ids)
-    M = [[0] * n for _ in range(n)]
-
-    for i, id_i in enumerate(ids):
-        X_i = reads[id_i]
-        for j, id_j in enumerate(ids):
-            if i == j:
-                M[i][j] = 0
-            else:
-                X_j = reads[id_j]
-                M[i][j] = overlap_score_only(
-                    X_i, X_j,
-                    match=args.match, mismatch=args.mismatch, gap=args.gap
-                )
+    seqs = [reads[u] for u in ids]
+    if args.use_codon:
+        M = np.zeros((len(ids), len(ids)), dtype=np.int32)
+        overlap_score_codon = charger_noyau_codon(args.codon_lib)
+        for i, X_i in enumerate(seqs):
+            for j, X_j in enumerate(seqs):
+                if i != j:
+                    M[i, j] = overlap_score_codon(X_i, X_j, args.match, args.mismatch, args.gap)
+    else:
+        M = overlap_matrix(seqs, match=args.match, mismatch=args.mismatch, gap=args.gap)
 
     with open(args.out, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f, lineterminator="\n")
         writer.writerow(["id"] + ids)
         for i, id_i in enumerate(ids):
-            writer.writerow([id_i] + M[i])
+            writer.writerow([id_i] + M[i].tolist())
 
     print(f"OK — Matrice de chevauchement écrite dans {args.out}")
 
@@ -15,13 +15,16 @@ Usage:
 """
 
 import argparse
+import functools
 import re
+import numpy as np
 from utils import read_sequences_from_fastq
-from prefixe_suffixe import (
-    construire_tables_dp,
-    meilleur_score_derniere_ligne,
-    remontee_chevauchement,
-)
+from prefixe_suffixe import derniere_ligne_dp
+
+# Motifs DOT appliqués au fichier entier (re.M) ; [^\S\n] = blanc sans saut de ligne,
+# pour qu'une correspondance ne déborde jamais sur la ligne suivante.
+MOTIF_ARETE = re.compile(r'^[^\S\n]*"([^"\n]+)"[^\S\n]*->[^\S\n]*"([^"\n]+)"', re.M)
+MOTIF_NOEUD_ISOLE = re.compile(r'^[^\S\n]*"([^"\n]+)"[^\S\n]*;[^\S\n]*$', re.M)
 
 
 def extraire_chemin_depuis_dot(chemin_dot: str) -> list[str]:
@@ -30,29 +33,25 @@ def extraire_chemin_depuis_dot(chemin_dot: str) -> list[str]:
 
     Elle parcourt le DOT réduit pour reconstruire l'ordre linéaire des nœuds (reads)
     en suivant les arêtes u→v. Le départ est choisi comme le nœud de degré entrant nul
-    (ou, à défaut, un nœud avec sortie).
+    (ou, à défaut, un nœud avec sortie). Le fichier est lu d'un bloc et analysé par finditer
+    avec les motifs précompilés MOTIF_ARETE et MOTIF_NOEUD_ISOLE.
 
     Rend une liste ordonnée des identifiants de reads (ordre de parcours).
     """
     aretes: dict[str, str] = {}
     indegre: dict[str, int] = {}
     noeuds = set()
-    motif_arete = re.compile(r'^\s*"([^"]+)"\s*->\s*"([^"]+)"')
     with open(chemin_dot, "r", encoding="utf-8") as f:
-        for ligne in f:
-            m = motif_arete.search(ligne)
-            if m:
-                u, v = m.group(1), m.group(2)
-                noeuds.add(u)
-                noeuds.add(v)
-                aretes[u] = v
-                indegre[v] = indegre.get(v, 0) + 1
-                indegre.setdefault(u, indegre.get(u, 0))
-            else:
-                # Enregistrer aussi les nœuds isolés s'ils apparaissent comme  "  "u";"
-                m2 = re.match(r'^\s*"([^"]+)"\s*;\s*$', ligne)
-                if m2:
-                    noeuds.add(m2.group(1))
+        texte = f.read()
+    for m in MOTIF_ARETE.finditer(texte):
+        u, v = m.group(1), m.group(2)
+        noeuds.add(u)
+        noeuds.add(v)
+        aretes[u] = v
+        indegre[v] = indegre.get(v, 0) + 1
+        indegre.setdefault(u, indegre.get(u, 0))
+    # Enregistrer aussi les nœuds isolés s'ils apparaissent comme  "  "u";"
+    noeuds.update(m.group(1) for m in MOTIF_NOEUD_ISOLE.finditer(texte))
 
     departs = [u for u in noeuds if indegre.get(u, 0) == 0 and u in aretes]
     if not departs:
@@ -78,19 +77,28 @@ def indice_prefixe_consomme(X: str, Y: str, match: int, mismatch: int, gap: int)
     Une fonction qui prend en argument deux reads X (gauche) et Y (droite) ainsi que
     trois scores (match, mismatch, gap).
 
-    Elle construit la DP de chevauchement suffixe(X)→préfixe(Y) via construire_tables_dp,
-    récupère j* sur la dernière ligne avec meilleur_score_derniere_ligne, puis remonte
-    l’alignement optimal avec remontee_chevauchement. L’indice du préfixe de Y consommé
-    est le nombre de caractères non ‘-’ dans l’alignement de Y.
+    Elle calcule la dernière ligne de la DP de chevauchement suffixe(X)→préfixe(Y) via
+    derniere_ligne_dp et en prend j* (premier maximum, comme meilleur_score_derniere_ligne).
+    L’indice du préfixe de Y consommé est le nombre de caractères non ‘-’ dans l’alignement
+    de Y ; or la remontée part de (m, j*) et s’arrête à j == 0 en décrémentant j d’exactement
+    une unité à chaque caractère de Y aligné (diag ou left) : ce nombre vaut donc j*, et
+    la remontée est inutile.
 
     Rend un entier j (0 ≤ j ≤ len(Y)) correspondant à la longueur du préfixe de Y à ignorer
     lors de la concaténation (on ajoute Y[j:]).
     """
-    V, BT = construire_tables_dp(X, Y, match=match, mismatch=mismatch, gap=gap)
-    _, j_etoile = meilleur_score_derniere_ligne(V)
-    _, alignY = remontee_chevauchement(X, Y, BT, j_etoile)
-    j = sum(1 for c in alignY if c != '-')
-    return j
+    return int(np.argmax(derniere_ligne_dp(X, Y, match=match, mismatch=mismatch, gap=gap)))
+
+
+@functools.lru_cache(maxsize=None)
+def _overlap_j(X: str, Y: str, match: int, mismatch: int, gap: int) -> int:
+    """
+    Version mémoïsée de indice_prefixe_consomme, utilisée par assemble.
+
+    La clé porte sur les séquences elles-mêmes plutôt que sur les IDs : un même ID lu
+    dans un autre FASTQ ne peut pas réutiliser un résultat périmé.
+    """
+    return indice_prefixe_consomme(X, Y, match, mismatch, gap)
 
 
 def assemble(chemin_reads: str, chemin_dot: str, match: int, mismatch: int, gap: int) -> str:
@@ -100,7 +108,7 @@ def assemble(chemin_reads: str, chemin_dot: str, match: int, mismatch: int, gap:
 
     Elle lit les reads (id → séquence), extrait l’ordre linéaire des reads depuis le DOT réduit,
     puis assemble la séquence finale en calculant, pour chaque paire (X, Y), l’indice j de préfixe
-    consommé via les fonctions importées de prefixe_suffixe, et concatène Y[j:].
+    consommé via indice_prefixe_consomme (résultats mémoïsés entre appels), et concatène Y[j:].
 
     Rend la séquence nucléotidique assemblée sous forme de chaîne.
     """
@@ -109,12 +117,12 @@ def assemble(chemin_reads: str, chemin_dot: str, match: int, mismatch: int, gap:
     if not ordre:
         raise ValueError("Ordre vide extrait du DOT.")
 
-    S = reads[ordre[0]]
+    morceaux = [reads[ordre[0]]]
     for a, b in zip(ordre, ordre[1:]):
         Xa, Yb = reads[a], reads[b]
-        j = indice_prefixe_consomme(Xa, Yb, match, mismatch, gap)
-        S += Yb[j:]
-    return S
+        j = _overlap_j(Xa, Yb, match, mismatch, gap)
+        morceaux.append(Yb[j:])
+    return ''.join(morceaux)
 
 
 def main():
@@ -0,0 +1,60 @@
+import pytest
+
+from graph import build_graph_from_matrix, read_scores_matrix
+
+
+def ecrire_csv(tmp_path, contenu: str) -> str:
+    chemin = tmp_path / "scores.csv"
+    chemin.write_text(contenu, encoding="utf-8")
+    return str(chemin)
+
+
+def test_read_scores_matrix_range_les_lignes_selon_l_entete(tmp_path):
+    ids, M = read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\nb,1,2\na,3,4\n"))
+    assert ids == ["a", "b"]
+    assert M.tolist() == [[3, 4], [1, 2]]
+
+
+def test_read_scores_matrix_rejette_une_ligne_manquante(tmp_path):
+    with pytest.raises(ValueError, match="manquante 'b'"):
+        read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\na,0,5\n"))
+
+
+def test_read_scores_matrix_rejette_une_ligne_dupliquee(tmp_path):
+    with pytest.raises(ValueError, match="dupliquée 'a'"):
+        read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\na,0,5\na,1,2\nb,3,0\n"))
+
+
+def test_build_graph_from_matrix_ignore_la_diagonale(tmp_path):
+    ids, M = read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\na,9,5\nb,0,9\n"))
+    u, v, s = build_graph_from_matrix(ids, M, threshold=0)
+    assert list(zip(u.tolist(), v.tolist(), s.tolist())) == [(0, 1, 5), (1, 0, 0)]
+
+
+def test_read_scores_matrix_accepte_des_ids_avec_diese(tmp_path):
+    contenu = "id,HWI:1#0/1,#b\nHWI:1#0/1,0,7\n#b,3,0\n"
+    ids, M = read_scores_matrix(ecrire_csv(tmp_path, contenu))
+    assert ids == ["HWI:1#0/1", "#b"]
+    assert M.tolist() == [[0, 7], [3, 0]]
+
+
+def test_read_scores_matrix_rejette_un_commentaire_dans_une_cellule(tmp_path):
+    with pytest.raises(ValueError, match="Score non entier en"):
+        read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\na,0,5 # c\nb,3,0\n"))
+
+
+def test_read_scores_matrix_garde_les_grands_scores_exacts(tmp_path):
+    ids, M = read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\na,0,3000000000\nb,3,0\n"))
+    assert int(M[0, 1]) == 3000000000
+
+
+def test_read_scores_matrix_rejette_un_score_hors_limites(tmp_path):
+    with pytest.raises(ValueError, match=r"Score non entier en \(a,b\)"):
+        read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\na,0,1e30\nb,3,0\n"))
+
+
+def test_read_scores_matrix_nomme_la_ligne_incoherente(tmp_path):
+    with pytest.raises(ValueError, match="Ligne incohérente pour a: 3 valeurs, attendu 2."):
+        read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\nb,1,2\na,3,4,5\n"))
+    with pytest.raises(ValueError, match="Ligne incohérente pour a: 1 valeurs, attendu 2."):
+        read_scores_matrix(ecrire_csv(tmp_path, "id,a,b\na,3\nb,1\n"))
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+
+import prefixe_suffixe
+from prefixe_suffixe import DIAG, LEFT, UP, _type_scores, construire_tables_dp, overlap_matrix
+
+BAREMES = [(4, -4, -8), (1, -1, -1), (2, -3, -1), (3000, -1000, -2000)]   # le dernier passe en int32
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "numpy"])
+def noyaux(request, monkeypatch):
+    """Force les noyaux Numba (_fill_dp, _build_matrix…) ou leurs équivalents NumPy."""
+    monkeypatch.setattr(prefixe_suffixe, "NUMBA_DISPONIBLE", request.param)
+    return request.param
+
+
+def tables_reference(X: str, Y: str, match: int, mismatch: int, gap: int, band: int | None = None):
+    """Remplissage cellule par cellule en Python pur (égalités : diag, puis up, puis left)."""
+    m, n = len(X), len(Y)
+    _, sentinelle = _type_scores(m, n, match, mismatch, gap)
+    V = [[sentinelle] * (n + 1) for _ in range(m + 1)]
+    BT = [[DIAG] * (n + 1) for _ in range(m + 1)]
+    for j in range(n + 1):
+        V[0][j], BT[0][j] = j * gap, LEFT
+    for i in range(1, m + 1):
+        V[i][0], BT[i][0] = 0, UP
+    BT[0][0] = DIAG
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if band is not None and abs(i - j) > band:
+                continue
+            s = match if X[i - 1] == Y[j - 1] else mismatch
+            candidats = [V[i - 1][j - 1] + s, V[i - 1][j] + gap, V[i][j - 1] + gap]
+            BT[i][j] = candidats.index(max(candidats))
+            V[i][j] = max(candidats)
+    return V, BT
+
+
+def reads_aleatoires(graine: int, k: int) -> list[str]:
+    rng = random.Random(graine)
+    return ["".join(rng.choice("ACGTN" if rng.random() < 0.2 else "ACGT") for _ in range(rng.randint(0, 12)))
+            for _ in range(k)]
+
+
+@pytest.mark.parametrize("band", [None, 0, 2, 5])
+@pytest.mark.parametrize("bareme", BAREMES)
+def test_construire_tables_dp_egale_la_reference(noyaux, bareme, band):
+    reads = reads_aleatoires(1, 12)
+    for X, Y in zip(reads, reads[1:]):
+        V, BT = construire_tables_dp(X, Y, *bareme, band=band)
+        V_ref, BT_ref = tables_reference(X, Y, *bareme, band=band)
+        assert V.tolist() == V_ref, (X, Y)
+        assert BT.tolist() == BT_ref, (X, Y)
+
+
+@pytest.mark.parametrize("bareme", BAREMES)
+def test_overlap_matrix_egale_la_reference(noyaux, bareme):
+    reads = reads_aleatoires(2, 6)
+    attendu = np.array([[0 if i == j else max(tables_reference(X, Y, *bareme)[0][-1])
+                         for j, Y in enumerate(reads)] for i, X in enumerate(reads)])
+    M = overlap_matrix(reads, *bareme)
+    assert M.dtype == np.int32
+    assert M.tolist() == attendu.tolist()
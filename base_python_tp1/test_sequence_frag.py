@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from prefixe_suffixe import construire_tables_dp, meilleur_score_derniere_ligne, remontee_chevauchement
+from sequence_frag import indice_prefixe_consomme
+
+
+def alignement_Y(X: str, Y: str, match: int, mismatch: int, gap: int) -> str:
+    V, BT = construire_tables_dp(X, Y, match, mismatch, gap)
+    _, j_etoile = meilleur_score_derniere_ligne(V)
+    return remontee_chevauchement(X, Y, BT, j_etoile)[1]
+
+
+def prefixe_par_remontee(X: str, Y: str, match: int, mismatch: int, gap: int) -> int:
+    """Ancienne définition : nombre de caractères non '-' de Y dans l'alignement remonté."""
+    return sum(1 for c in alignement_Y(X, Y, match, mismatch, gap) if c != '-')
+
+
+@pytest.mark.parametrize("X, Y, j_attendu, avec_up", [
+    ("TTTTACGTAACGT", "ACGTACGTGG", 8, True),       # un pas « up » (gap dans Y)
+    ("GGACGTTTACGTCA", "ACGTACGTCAGG", 10, True),   # deux pas « up » consécutifs
+    ("AAAA", "CCCC", 0, False),                     # aucun chevauchement : j* = 0
+    ("", "ACGT", 0, False),
+    ("ACGT", "", 0, False),
+])
+def test_indice_prefixe_consomme_cas_limites(X, Y, j_attendu, avec_up):
+    assert ('-' in alignement_Y(X, Y, 4, -4, -8)) == avec_up
+    assert prefixe_par_remontee(X, Y, 4, -4, -8) == j_attendu
+    assert indice_prefixe_consomme(X, Y, 4, -4, -8) == j_attendu
+
+
+def test_indice_prefixe_consomme_egale_la_remontee():
+    rng = random.Random(0)
+    for _ in range(400):
+        X = ''.join(rng.choice("ACG") for _ in range(rng.randint(0, 20)))
+        Y = ''.join(rng.choice("ACG") for _ in range(rng.randint(0, 20)))
+        scores = rng.choice([(4, -4, -8), (1, -1, -1), (2, -3, -2), (1, 0, 0)])
+        assert indice_prefixe_consomme(X, Y, *scores) == prefixe_par_remontee(X, Y, *scores), (X, Y, scores)